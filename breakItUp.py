@@ -48,8 +48,11 @@ Local routines handle this here.
 
 """
 
+from bisect import bisect_right
+from fractions import Fraction
+from functools import lru_cache
+import math
 from typing import Union, Optional
-import numpy as np  # note optional - not part of prospective music21 integration
 import unittest
 
 
@@ -131,6 +134,7 @@ class ReGrouper:
     completely from scratch (ignoring all other parameters and defaults).
     Use this for advanced cases requiring non-standard metrical structures
     including those without 2-/3- grouping, or even nested hierarchies.
+    Each level must be sorted; levels may be lists, tuples, or NumPy arrays.
 
     splitSameLevel:
     in cases of metrical structures with a 3-grouping
@@ -154,6 +158,10 @@ class ReGrouper:
     'levels' parameter should be enough for a particular editorial style.
     """
 
+    # One instance per note: no per-instance __dict__
+    __slots__ = ('offsetHierarchy', 'noteLength', 'noteStartOffset', 'splitSameLevel',
+                 'offsetDurationPairs')
+
     def __init__(self,
                  noteStartOffset: Union[int, float],
                  noteLength: Union[int, float],
@@ -164,145 +172,408 @@ class ReGrouper:
                  splitSameLevel: bool = False):
 
         # Retrieve or create the metrical structure
-        if offsetHierarchy:
-            self.offsetHierarchy = offsetHierarchy
-        elif pulseLengths:
-            self.offsetHierarchy = offsetListFromPulseLengths(pulseLengths,
-                                                              require2or3betweenLevels=False)
-        elif levels:
-            if not timeSignature:
-                raise ValueError('To specify levels, please also enter a valid time signature.')
-            self.offsetHierarchy = offsetsFromTSAndLevels(timeSignature, levels)
-        else:  # timeSignature, not levels specified
-            self.offsetHierarchy = offsetsFromTSAndLevels(timeSignature)
-
-        if not self.offsetHierarchy:
-            raise ValueError('Could not create an offsetHierarchy.'
-                             'Please input a valid time signature or equivalent.')
+        self.offsetHierarchy = _resolveOffsetHierarchy(timeSignature, levels,
+                                                       pulseLengths, offsetHierarchy)
 
         self.noteLength = noteLength
         self.noteStartOffset = noteStartOffset
         self.splitSameLevel = splitSameLevel
 
-        # Initialise
-        self.offsetDurationPairs = []
-        self.updatedOffset = noteStartOffset
-        self.remainingLength = noteLength
-        self.levelPass()
+        self.offsetDurationPairs = splitNote(noteStartOffset, noteLength,
+                                             self.offsetHierarchy, splitSameLevel)
+
+    @classmethod
+    def batch(cls,
+              notes,
+              timeSignature: Optional[str] = None,
+              levels: Optional[list] = None,
+              pulseLengths: Optional[list] = None,
+              offsetHierarchy: Optional[list] = None,
+              splitSameLevel: bool = False):
+        """
+        Split many notes in the same metrical context
+        (e.g. all the notes of a measure or a part in one time signature).
+
+        Takes an iterable of (noteStartOffset, noteLength) pairs,
+        plus the same metrical options as ReGrouper, and
+        returns a list with the offsetDurationPairs for each note in turn.
+        The hierarchy is resolved (and validated) once, rather than once per note,
+        and no ReGrouper instances are created.
+        For the NumPy equivalent, see splitMany.
+
+        >>> ReGrouper.batch([(0.5, 2), (3, 2)], timeSignature='4/4')
+        [[(0.5, 0.5), (1.0, 1.0), (2.0, 0.5)], [(3, 1.0), (4.0, 1.0)]]
+        """
+        # Already one shared tuple of tuples (cached or interned): lookup tables found by identity
+        hierarchy = _resolveOffsetHierarchy(timeSignature, levels, pulseLengths, offsetHierarchy)
+        return [splitNote(noteStartOffset, noteLength, hierarchy, splitSameLevel)
+                for noteStartOffset, noteLength in notes]
 
-    # ------------------------------------------------------------------------------
 
-    def levelPass(self):
-        """
-        Having established the structure of the offsetHierarchy,
-        this method iterates across the levels of that hierarchy to find
-        the current offset position, and (through advanceOneStep) the offset position to map to.
+# ------------------------------------------------------------------------------
+
+def splitNote(noteStartOffset: Union[int, float],
+              noteLength: Union[int, float],
+              offsetHierarchy,
+              splitSameLevel: bool = False):
+    """
+    The core of ReGrouper as a plain function:
+    split one note given an offset hierarchy (a sequence of sorted levels)
+    and return the list of offset-duration pairs.
+    See ReGrouper for the options, and
+    splitMany for the equivalent across many notes.
+
+    Having established the structure of the offsetHierarchy,
+    this function iterates across the levels of that hierarchy to find
+    the current offset position, and the offset position to map to.
+
+    Each pass of the loop handles one such mapping,
+    typically advancing up one (or more) layer of the metrical hierarchy each time.
+    'Typically' because splitSameLevel is supported where relevant.
+
+    Each iteration creates a new offset-duration pair
+    that records the constituent parts of the split note.
+
+    Offsets are matched against the hierarchy exactly (by value, not within a tolerance).
+    The hierarchy's positions are exact binary fractions (0.5, 0.125, ...), and
+    ints, floats, and Fractions (e.g. music21 offsets) of equal value compare and hash equal,
+    so any of these can be used for the note without conversion.
+
+    >>> splitNote(0.5, 2, offsetHierarchyFromTS('6/8'))
+    [(0.5, 1.0), (1.5, 1.0)]
+    """
+    cellEnds, sameLevelCellEnds = _lookupTables(offsetHierarchy)
+    if splitSameLevel:  # relevant option for e.g. 6/8
+        cellEnds = sameLevelCellEnds
 
-        This method runs once for each such mapping,
-        typically advancing up one (or more) layer of the metrical hierarchy with each call.
-        'Typically' because splitSameLevel is supported where relevant.
+    # Short-circuit the common case: a note that fits within the cell it starts in
+    cellEnd = cellEnds.get(noteStartOffset)
+    if cellEnd is not None and 0 < noteLength <= cellEnd - noteStartOffset:
+        return [(noteStartOffset, noteLength)]
 
-        Each iteration creates a new offset-duration pair
-        stored in the offsetDurationPairs list
-        that records the constituent parts of the split note.
-        """
+    lowestLevel = offsetHierarchy[-1]
+    offset = noteStartOffset
+    remainingLength = noteLength
+    pairs = []
 
-        for levelIndex in range(len(self.offsetHierarchy)):
+    while remainingLength > 0:
 
-            if self.remainingLength <= 0:  # sic, here due to the various routes through
-                return
+        # The next position to move on to, precomputed for every position in the hierarchy
+        nextPosition = cellEnds.get(offset)
+        if nextPosition is None:  # offset not in the hierarchy at all: get to lowest level
+            i = bisect_right(lowestLevel, offset)  # levels are sorted
+            nextPosition = lowestLevel[i] if i < len(lowestLevel) else math.inf
 
-            thisLevel = self.offsetHierarchy[levelIndex]
+        durationToNextPosition = nextPosition - offset
+        if remainingLength <= durationToNextPosition:  # done
+            pairs.append((offset, remainingLength))
+            remainingLength = 0
+        else:  # updated offset and position; run again as may have jumped a level
+            pairs.append((offset, durationToNextPosition))
+            offset = nextPosition
+            remainingLength -= durationToNextPosition
 
-            if self.updatedOffset in thisLevel:
-                if levelIndex == 0:  # i.e. updatedOffset == 0
-                    self.offsetDurationPairs.append((self.updatedOffset,
-                                                     self.remainingLength))
-                    return
-                else:  # level up. NB: duplicates in nested hierarchy help here
-                    if self.splitSameLevel:  # relevant option for e.g. 6/8
-                        self.advanceOneStep(thisLevel)
-                    else:  # usually
-                        self.advanceOneStep(self.offsetHierarchy[levelIndex - 1])
+    return pairs
 
-        if self.remainingLength > 0:  # offset not in the hierarchy at all
-            self.advanceOneStep(self.offsetHierarchy[-1])  # get to lowest level
-            # Now start the process with the metrical structure:
-            self.levelPass()
 
-    def advanceOneStep(self, positionsList: list):
-        """
-        For an offset position, and a metrical level expressed as a list of offsets,
-        finds the next higher value from those levels.
-        Used for determining iterative divisions.
-        """
-        for p in positionsList:
-            if p > self.updatedOffset:
-                durationToNextPosition = p - self.updatedOffset
-                if self.remainingLength <= durationToNextPosition:
-                    self.offsetDurationPairs.append((self.updatedOffset,
-                                                     self.remainingLength))
-                    # done but still reduce remainingLength to end the whole process in levelPass
-                    self.remainingLength -= durationToNextPosition
-                    return
-                else:  # self.remainingLength > durationToNextPosition:
-                    self.offsetDurationPairs.append((self.updatedOffset,
-                                                     durationToNextPosition))
-                    # Updated offset and position; run again
-                    self.updatedOffset = p
-                    self.remainingLength -= durationToNextPosition
-                    self.levelPass()  # NB: to re-start from top as may have jumped a level
-                    return
+# ------------------------------------------------------------------------------
+
+def _resolveOffsetHierarchy(timeSignature: Optional[str] = None,
+                            levels: Optional[list] = None,
+                            pulseLengths: Optional[list] = None,
+                            offsetHierarchy: Optional[list] = None):
+    """
+    Retrieve or create the metrical structure from the
+    options of ReGrouper (see the docs there for the order of precedence).
+    """
+    if offsetHierarchy:
+        # Lists or NumPy levels to one shared tuple of tuples (of Python floats),
+        # so the lookup tables are found by identity rather than rebuilt for each note
+        offsetHierarchy = _internHierarchy(offsetHierarchy)
+    elif pulseLengths:
+        offsetHierarchy = _offsetHierarchyFromPulseLengths(tuple(pulseLengths))
+    elif levels:
+        if not timeSignature:
+            raise ValueError('To specify levels, please also enter a valid time signature.')
+        offsetHierarchy = offsetsFromTSAndLevels(timeSignature, tuple(levels))
+    else:  # timeSignature, not levels specified
+        offsetHierarchy = offsetsFromTSAndLevels(timeSignature)
+
+    if not offsetHierarchy:
+        raise ValueError('Could not create an offsetHierarchy.'
+                         'Please input a valid time signature or equivalent.')
+
+    return offsetHierarchy
+
+
+def splitMany(noteStartOffsets,
+              noteLengths,
+              timeSignature: Optional[str] = None,
+              levels: Optional[list] = None,
+              pulseLengths: Optional[list] = None,
+              offsetHierarchy: Optional[list] = None,
+              splitSameLevel: bool = False):
+    """
+    Batch equivalent of ReGrouper for many notes in the same metrical context
+    (e.g. a whole part in one time signature).
+
+    Takes sequences (or NumPy arrays) of note start offsets and lengths,
+    plus the same metrical options as ReGrouper, and
+    returns three parallel NumPy arrays:
+    the index of the input note that each part comes from,
+    and the offset and duration of that part.
+    Parts are ordered by note and then by position,
+    i.e. the same pairs as ReGrouper's offsetDurationPairs for each note in turn.
+
+    The hierarchy is created once, and the splitting proceeds for all notes at once:
+    each pass takes one step for every note that is not yet complete,
+    with one NumPy call per metrical level.
+    Requires NumPy (imported here, not by the module as a whole).
+
+    >>> splitMany([0.5, 3], [2, 2], timeSignature='4/4')
+    (array([0, 0, 0, 1, 1]), array([0.5, 1. , 2. , 3. , 4. ]), array([0.5, 1. , 0.5, 1. , 1. ]))
+    """
+    import numpy as np  # optional - not part of prospective music21 integration
+
+    hierarchy = _resolveOffsetHierarchy(timeSignature, levels, pulseLengths, offsetHierarchy)
+    levelArrays = [np.asarray(level, dtype=float) for level in hierarchy]
+    numLevels = len(levelArrays)
+
+    offsets = np.array(noteStartOffsets, dtype=float)
+    remainingLengths = np.array(noteLengths, dtype=float)
+    active = np.flatnonzero(remainingLengths > 0)  # indices of notes not yet complete
+
+    noteIndices, partOffsets, partDurations = [], [], []
+
+    while active.size:
+        offset = offsets[active]
+        remainingLength = remainingLengths[active]
+
+        # Highest level each offset appears on (numLevels if none)
+        levelIndex = np.full(active.size, numLevels)
+        for k in range(numLevels - 1, -1, -1):
+            levelIndex[np.isin(offset, levelArrays[k])] = k
+
+        # Level to step along: usually the one above; see splitNote
+        stepLevel = levelIndex - 1
+        if splitSameLevel:
+            sameLevel = (levelIndex > 0) & (levelIndex < numLevels)
+            stepLevel[sameLevel] = levelIndex[sameLevel]
+
+        # Next higher position on that level (default: nowhere further to go)
+        nextPosition = offset.copy()
+        durationToNextPosition = remainingLength.copy()
+        for k in range(numLevels):
+            onLevel = np.flatnonzero(stepLevel == k)
+            if not onLevel.size:
+                continue
+            thisLevel = levelArrays[k]
+            i = thisLevel.searchsorted(offset[onLevel], side='right')
+            found = i < thisLevel.size
+            onLevel, i = onLevel[found], i[found]
+            nextPosition[onLevel] = thisLevel[i]
+            durationToNextPosition[onLevel] = thisLevel[i] - offset[onLevel]
+
+        done = remainingLength <= durationToNextPosition
+
+        noteIndices.append(active)
+        partOffsets.append(offset)
+        partDurations.append(np.where(done, remainingLength, durationToNextPosition))
+
+        offsets[active] = nextPosition
+        remainingLengths[active] = remainingLength - durationToNextPosition
+        active = active[~done]
+
+    if not noteIndices:
+        return np.array([], dtype=int), np.array([]), np.array([])
+
+    noteIndices = np.concatenate(noteIndices)
+    order = np.argsort(noteIndices, kind='stable')  # by note, then pass
+    return (noteIndices[order],
+            np.concatenate(partOffsets)[order],
+            np.concatenate(partDurations)[order])
 
 
 # ------------------------------------------------------------------------------
 
+# 'Hidden' layer/s implied by a time signature's numerator/s (see offsetHierarchyFromTS)
+hiddenLayerMappings = {
+    (4,): (2, 2),
+    (6,): (3, 3),
+    (9,): (3, 3, 3),  # alternative groupings need to be set out, e.g. 2+2+2+3
+    (12,): ((6, 6), (3, 3, 3, 3)),  # " e.g. 2+2+2+3
+    (15,): (3, 3, 3, 3, 3),  # " e.g. 2+2+2+3
+    (6, 9): ((6, 9), (3, 3, 3, 3, 3)),  # TODO generalise
+    (9, 6): ((6, 6), (3, 3, 3, 3, 3)),
+}
+
+supportedDenominators = [1, 2, 4, 8, 16, 32, 64]
+
+
+_internedHierarchies = {}  # offsetHierarchy (tuple of tuples): that same, canonical object
+_lastInterned = [()]  # most recent canonical hierarchy: usually the one needed next
+_lookupTablesCache = {}  # id(offsetHierarchy): (offsetHierarchy, tables); see _lookupTables
+
+
+def _internHierarchy(offsetHierarchy):
+    """
+    Return one canonical tuple of tuples for each distinct offsetHierarchy value,
+    freezing lists and NumPy arrays first (as Python floats: see ReGrouper).
+    So a user-defined hierarchy repeated note after note is compared
+    (or, if it differs from the last one, hashed) rather than rebuilt,
+    and shares lookup tables with any earlier equal hierarchy.
+    """
+    if not (isinstance(offsetHierarchy, tuple)
+            and all(isinstance(level, tuple) for level in offsetHierarchy)):
+        offsetHierarchy = tuple([tuple(level.tolist()) if hasattr(level, 'tolist') else tuple(level)
+                                 for level in offsetHierarchy])
+    if offsetHierarchy == _lastInterned[0]:  # cheaper than hashing
+        return _lastInterned[0]
+    canonical = _internedHierarchies.get(offsetHierarchy)
+    if canonical is None:
+        if len(_internedHierarchies) >= 128:  # e.g. many user-defined hierarchies
+            _internedHierarchies.clear()
+        _internedHierarchies[offsetHierarchy] = canonical = offsetHierarchy
+    _lastInterned[0] = canonical
+    return canonical
+
+
+def _lookupTables(offsetHierarchy):
+    """
+    Precompute the per-hierarchy lookups used by splitNote:
+    the 'cell end' for each position in the hierarchy (without and with splitSameLevel).
+    That is the next position on the level that a note starting there moves on to:
+    the level above the highest level that the position appears on
+    (or that same level, with splitSameLevel).
+    So a note that fits within that cell can be returned at once, and
+    each step of a split is a single lookup.
+
+    Tables are cached by the identity of the (immutable) canonical hierarchy:
+    hashing the whole hierarchy for every note costs more than the split.
+    Any other hierarchy (e.g. lists passed straight to splitNote) is interned first.
+    """
+    cached = _lookupTablesCache.get(id(offsetHierarchy))
+    if cached is not None and cached[0] is offsetHierarchy:
+        return cached[1]
+
+    offsetHierarchy = _internHierarchy(offsetHierarchy)
+    cached = _lookupTablesCache.get(id(offsetHierarchy))
+    if cached is not None and cached[0] is offsetHierarchy:
+        return cached[1]
+
+    cellEnds = {}
+    sameLevelCellEnds = {}
+    for levelIndex, level in enumerate(offsetHierarchy):
+        for offset in level:
+            if offset in cellEnds:  # already on a higher level
+                continue
+            if levelIndex == 0:  # nowhere further to go
+                cellEnds[offset] = sameLevelCellEnds[offset] = math.inf
+                continue
+            for ends, positionsList in ((cellEnds, offsetHierarchy[levelIndex - 1]),
+                                        (sameLevelCellEnds, level)):
+                i = bisect_right(positionsList, offset)
+                ends[offset] = positionsList[i] if i < len(positionsList) else math.inf
+
+    tables = (cellEnds, sameLevelCellEnds)
+    if len(_lookupTablesCache) >= 128:  # e.g. many user-defined hierarchies
+        _lookupTablesCache.clear()
+    _lookupTablesCache[id(offsetHierarchy)] = (offsetHierarchy, tables)
+    return tables
+
+
+@lru_cache(maxsize=None)
+def parseTS(tsStr: str):
+    """
+    Parse a time signature string into
+    the numerator layer/s (a tuple of tuples, after mapping to any 'hidden' layer/s),
+    the denominator, and
+    the measure length (in quarter length).
+    Cached separately from offsetHierarchyFromTS, which uses it,
+    so the parsing is shared across minimumPulse values.
+
+    >>> parseTS('6/8')
+    (((3, 3),), 8, 3.0)
+
+    >>> parseTS('2+3/4')
+    (((2, 3),), 4, 5.0)
+
+    >>> parseTS('12/8')
+    (((6, 6), (3, 3, 3, 3)), 8, 6.0)
+
+    >>> parseTS('5/4')  # a single numerator: no hidden layer
+    (((5,),), 4, 5.0)
+    """
+    numerator, denominator = tsStr.split('/')
+    numerators = tuple(int(x) for x in numerator.split('+'))
+    denominator = int(denominator)
+    # TODO if more than one '/' (e.g. 4/4 + 3/8) then split by + first
+
+    if denominator not in supportedDenominators:
+        raise ValueError("Invalid time signature denominator; chose from one of:"
+                         f" {supportedDenominators}.")
+
+    # Prep. 'hiddenLayer'/s
+    numerators = hiddenLayerMappings.get(numerators, numerators)
+    isNested = isinstance(numerators[0], tuple)
+    numeratorLayers = numerators if isNested else (numerators,)
+
+    measureLength = sum(numeratorLayers[0]) * 4 / denominator
+
+    return numeratorLayers, denominator, measureLength
+
+
+@lru_cache(maxsize=None)
 def offsetHierarchyFromTS(tsStr: str, minimumPulse: int = 64):
     """
     Create an offset hierarchy for almost any time signature
     directly from a string (e.g. '4/4') without dependencies.
-    Returns a list of lists with offset positions by level.
+    Returns a tuple of tuples with offset positions by level.
+
+    Results are cached (functools.lru_cache), so
+    splitting every note of a score in the same meter builds the hierarchy only once.
+    The returned tuples are shared between calls and must not be modified.
     
     For instance:    
 
     >>> offsetHierarchyFromTS('4/4')  # note the half cycle division
-    [[0.0, 4.0],
-    [0.0, 2.0, 4.0],
-    [0.0, 1.0, 2.0, 3.0, 4.0],
-    [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0],
+    ((0.0, 4.0),
+    (0.0, 2.0, 4.0),
+    (0.0, 1.0, 2.0, 3.0, 4.0),
+    (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0),
     ...
     
     >>> offsetHierarchyFromTS('6/8')  # note the macro-beat division
-    [[0.0, 3.0],
-    [0.0, 1.5, 3.0],
-    [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0],
+    ((0.0, 3.0),
+    (0.0, 1.5, 3.0),
+    (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0),
     ...
     
     Numerators like 5 and 7 are supported.
     Use the total value only to avoid segmentation about the denominator level:
     >>> offsetHierarchyFromTS('5/4')  # note no 2+3 or 3+2 level division
-    [[0.0, 5.0],
-    [0.0, 1.0, 2.0, 3.0, 4.0, 5.0],
+    ((0.0, 5.0),
+    (0.0, 1.0, 2.0, 3.0, 4.0, 5.0),
     ... 
 
     Or use numerator addition in the form 'X+Y/Z' to clarify this level ...
     
     >>> offsetHierarchyFromTS('2+3/4')  # note the 2+3 division
-    [[0.0, 5.0],
-    [0.0, 2.0, 5.0],
-    [0.0, 1.0, 2.0, 3.0, 4.0, 5.0],
+    ((0.0, 5.0),
+    (0.0, 2.0, 5.0),
+    (0.0, 1.0, 2.0, 3.0, 4.0, 5.0),
     ...
 
     >>> offsetHierarchyFromTS('2+2+3/8')  # note the 2+2+3 division
-    [[0.0, 4.5],
-    [0.0, 1.0, 2.0, 4.5],
-    [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 4.5],
+    ((0.0, 4.5),
+    (0.0, 1.0, 2.0, 4.5),
+    (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 4.5),
     ... 
     
     >>> offsetHierarchyFromTS('2+2+2+3/8')  # note the 2+2+2+3 division
-    [[0.0, 4.5],
-    [0.0, 1.0, 2.0, 3.0, 4.5],
-    [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5],
+    ((0.0, 4.5),
+    (0.0, 1.0, 2.0, 3.0, 4.5),
+    (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5),
     ... 
         
     Only standard denominators are supported:
@@ -319,76 +590,45 @@ def offsetHierarchyFromTS(tsStr: str, minimumPulse: int = 64):
     """
 
     # Prep and checks
-    numerator, denominator = tsStr.split('/')
-    numerators = [int(x) for x in numerator.split('+')]
-    denominator = int(denominator)
-    # TODO if more than one '/' (e.g. 4/4 + 3/8) then split by + first
+    numeratorLayers, denominator, measureLength = parseTS(tsStr)
 
-    supportedDenominators = [1, 2, 4, 8, 16, 32, 64]
-    if denominator not in supportedDenominators:
-        raise ValueError("Invalid time signature denominator; chose from one of:"
-                         f" {supportedDenominators}.")
     if minimumPulse not in supportedDenominators:
         raise ValueError(
             "Invalid minimumPulse: it should be expressed as a note value, from one of"
             f" {supportedDenominators}.")
 
-    # Prep. 'hiddenLayer'/s
-    hiddenLayerMappings = (
-        ([4], [2, 2]),
-        ([6], [3, 3]),
-        ([9], [3, 3, 3]),  # alternative groupings need to be set out, e.g. 2+2+2+3 
-        ([12], [[6, 6], [3, 3, 3, 3]]),  # " e.g. 2+2+2+3 
-        ([15], [3, 3, 3, 3, 3]),  # " e.g. 2+2+2+3 
-        ([6, 9], [[6, 9], [3, 3, 3, 3, 3]]),  # TODO generalise
-        ([9, 6], [[6, 6], [3, 3, 3, 3, 3]]),
-    )
-
-    for h in hiddenLayerMappings:
-        if numerators == h[0]:
-            numerators = h[1]
-
-    if type(numerators[0]) == list:
-        sumNum = sum(numerators[0])
-    else:
-        sumNum = sum(numerators)
-
-    measureLength = sumNum * 4 / denominator
-
     # Now ready for each layer in order: 
 
     # 1. top level = whole cycle (always included as entry[0])
     offsetHierarchy = [[0.0, measureLength]]
 
     # 2. 'hidden' layer/s
-    if len(numerators) > 1:  # whole cycle covered.
-        if type(numerators[0]) == list:
-            for level in numerators:
-                offsets = offsetsFromBeatPattern(level, denominator)
-                offsetHierarchy.append(offsets)
-        else:
-            offsets = offsetsFromBeatPattern(numerators, denominator)
+    for level in numeratorLayers:
+        if len(level) > 1:  # a single numerator is the whole cycle, already covered.
+            offsets = offsetsFromBeatPattern(level, denominator)
             offsetHierarchy.append(offsets)
 
     # 3. Finally, everything at the denominator level and shorter:
     thisDenominatorPower = supportedDenominators.index(denominator)
     maxDenominatorPower = supportedDenominators.index(minimumPulse)
 
+    # The finest grid once; each coarser level is every nth entry of it (all exact binary values)
+    finestOffsets = offsetsFromLengths(measureLength, 4 / minimumPulse)
     for thisDenominator in supportedDenominators[thisDenominatorPower:maxDenominatorPower + 1]:
-        thisQL = 4 / thisDenominator
-        offsets = offsetsFromLengths(measureLength, thisQL)
+        offsets = finestOffsets[::minimumPulse // thisDenominator]
         offsetHierarchy.append(offsets)
 
-    return offsetHierarchy
+    return tuple(tuple(level) for level in offsetHierarchy)
 
 
 def offsetsFromTSAndLevels(timeSigStr: str,  # Union[str, meter.timeSignature]
-                           levels: list = [0, 1, 2, 3],
+                           levels: Union[list, tuple] = (0, 1, 2, 3),
                            useMusic21: bool = False):
     """
     Gets offsets from a time signature and a list of levels.
-    Records the offsets associated with each level as a list,
-    and return a list of those lists.
+    Records the offsets associated with each level as a tuple,
+    and return a tuple of those tuples.
+    Results are cached by (timeSigStr, levels, useMusic21).
 
     Levels are defined by the hierarchies recorded in the time signature.
     The 0th level for the full cycle (offset 0.0 and full measure length) is always included.
@@ -414,21 +654,31 @@ def offsetsFromTSAndLevels(timeSigStr: str,  # Union[str, meter.timeSignature]
 
     For, instance, 4/4 recognises the levels corresponding to whole, half, quarter notes etc
     >>> offsetsFromTSAndLevels('4/4', [1, 2, 3], useMusic21=True)
-    [[0.0], [0.0, 2.0], [0.0, 1.0, 2.0, 3.0], [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5]]
+    ((0.0,), (0.0, 2.0), (0.0, 1.0, 2.0, 3.0), (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5))
 
     But 6/8 skips straight from the meter to the 1/8 note without the half-measure (compound) beat.
     >>> offsetsFromTSAndLevels('6/8', [1, 2], useMusic21=True)
-    [[0.0], [0.0, 0.5, 1.0, 1.5, 2.0, 2.5],
-    [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75]]
+    ((0.0,), (0.0, 0.5, 1.0, 1.5, 2.0, 2.5),
+    (0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75))
 
     This function provides a hard-coded workaround that's called when useMusic21=False (default).
     Note also the inclusion of the full cycle length here (useful in ReGrouper).
     >>> offsetsFromTSAndLevels('6/8', [1, 2], useMusic21=False)
-    [[0.0, 3.0], [0.0, 1.5, 3.0], [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0]]
+    ((0.0, 3.0), (0.0, 1.5, 3.0), (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0))
 
     The music21 beamSequence method may also be useful here (i.e. integrating the two).
     See discussion on music21, issue 992.
     """
+    return _offsetsFromTSAndLevels(timeSigStr, tuple(levels), useMusic21)
+
+
+@lru_cache(maxsize=None)
+def _offsetsFromTSAndLevels(timeSigStr: str,
+                            levels: tuple,
+                            useMusic21: bool):
+    """
+    Cached implementation of offsetsFromTSAndLevels (levels must be hashable).
+    """
 
     if max(levels) > 6:
         raise ValueError('6 is the maximum level depth supported.')
@@ -443,19 +693,20 @@ def offsetsFromTSAndLevels(timeSigStr: str,  # Union[str, meter.timeSignature]
         ms = meter.MeterSequence(timeSigStr)
         ms.subdivideNestedHierarchy(max(levels))
         for level in levels:
-            offsetsThisLevel = [x[0] for x in ms.getLevelSpan(level)]
+            offsetsThisLevel = tuple(x[0] for x in ms.getLevelSpan(level))
             offsetsByLevel.append(offsetsThisLevel)
     else:
         fullHierarchy = offsetHierarchyFromTS(timeSigStr)
         for level in levels:
             offsetsByLevel.append(fullHierarchy[level])
 
-    return offsetsByLevel
+    return tuple(offsetsByLevel)
 
 
 def offsetListFromPulseLengths(pulseLengths: list,
                                measureLength: Union[float, int, None] = None,
-                               require2or3betweenLevels: bool = False):
+                               require2or3betweenLevels: bool = False,
+                               useNumpy: bool = False):
     """
     Convert a list of pulse lengths into a corresponding list of offset positions.
     All values (pulse lengths, offset positions, and measureLength) 
@@ -487,6 +738,9 @@ def offsetListFromPulseLengths(pulseLengths: list,
     longer than the longest pulse and
     (if require2or3betweenLevels is True) then
     exactly 2x or 3x longer.
+
+    useNumpy is passed on to offsetsFromLengths for each level:
+    worth it for very deep or long structures, not for the handful of offsets in a typical measure.
     """
 
     pulseLengths = sorted(pulseLengths)[::-1]  # largest number first
@@ -507,12 +761,24 @@ def offsetListFromPulseLengths(pulseLengths: list,
     offsetList = []
 
     for pulseLength in pulseLengths:
-        offsets = offsetsFromLengths(measureLength, pulseLength)
+        offsets = offsetsFromLengths(measureLength, pulseLength, useNumpy=useNumpy)
         offsetList.append(offsets)
 
     return offsetList
 
 
+@lru_cache(maxsize=128)
+def _offsetHierarchyFromPulseLengths(pulseLengths: tuple):
+    """
+    Cached offsetListFromPulseLengths for ReGrouper's pulseLengths option
+    (pulseLengths must be hashable).
+    Returns a tuple of tuples so that repeated notes with the same pulse lengths
+    share one hierarchy (and so one set of lookup tables).
+    """
+    offsetList = offsetListFromPulseLengths(pulseLengths, require2or3betweenLevels=False)
+    return tuple(tuple(level) for level in offsetList)
+
+
 # ------------------------------------------------------------------------------
 
 # Subsidiary one-level converters
@@ -520,21 +786,24 @@ def offsetListFromPulseLengths(pulseLengths: list,
 def offsetsFromLengths(measureLength: Union[float, int],
                        pulseLength: Union[float, int],
                        includeMeasureLength: bool = True,
-                       useNumpy: bool = True):
+                       useNumpy: bool = False):
     """
     Convert a pulse length and measure length into a list of offsets.
     All expressed in quarter length.
     If includeMeasureLength is True (default) then each level ends with the full cycle length
     (i.e. the offset of the start of the next cycle).
+
+    The default (useNumpy=False) uses plain Python, which is faster than NumPy
+    for the handful of offsets in a measure (and NumPy is only imported if used).
+    Both routes give the same values (i * pulseLength, as for np.arange),
+    without the drift of adding pulseLength repeatedly.
     """
-    if useNumpy:
-        offsets = [i for i in np.arange(0, measureLength, pulseLength)]
-    else:  # music21 avoids numpy right?
-        currentIndex = 0
-        offsets = []
-        while currentIndex < measureLength:
-            offsets.append(currentIndex)
-            currentIndex += pulseLength
+    if useNumpy:  # optional - not part of prospective music21 integration
+        import numpy as np
+        offsets = np.arange(0, measureLength, pulseLength).tolist()  # Python floats, in C
+    else:  # music21 avoids numpy
+        numPulses = math.ceil(measureLength / pulseLength)  # same count as np.arange
+        offsets = [i * pulseLength for i in range(numPulses)]
 
     if includeMeasureLength:
         return offsets + [measureLength]
@@ -571,214 +840,80 @@ def offsetsFromBeatPattern(beatList: list,
 # For reference and testing.
 # Down to 1/32 note level [0, 0.125 ... ] in each case
 
-offsetHierarchyExamples = {
+def _exampleLevels(measureLength: Union[float, int], levels: list):
+    """
+    Build the offsets for each level of an example hierarchy from either
+    a pulse length (for regular levels: 0, pulse, 2 * pulse ... measureLength) or
+    an explicit list of offsets (for irregular levels like 2+3).
+    """
+    offsetLevels = []
+    for level in levels:
+        if isinstance(level, list):
+            offsetLevels.append([float(x) for x in level])
+        else:
+            numPulses = int(measureLength / level)
+            offsetLevels.append([i * float(level) for i in range(numPulses + 1)])
+    return offsetLevels
+
 
-    '2/2': [[0.0, 4.0],
-            [0.0, 2.0, 4.0],
-            [0.0, 1.0, 2.0, 3.0, 4.0],
-            [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0],
-            [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75,
-             2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5, 3.75, 4.0],
-            [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-             1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875,
-             2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875,
-             3.0, 3.125, 3.25, 3.375, 3.5, 3.625, 3.75, 3.875, 4.0]],
-
-    '3/2': [[0.0, 6.0],
-            [0.0, 2.0, 4.0, 6.0],
-            [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
-            [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0],
-            [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5, 3.75,
-             4.0, 4.25, 4.5, 4.75, 5.0, 5.25, 5.5, 5.75, 6.0],
-            [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-             1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875,
-             2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875,
-             3.0, 3.125, 3.25, 3.375, 3.5, 3.625, 3.75, 3.875,
-             4.0, 4.125, 4.25, 4.375, 4.5, 4.625, 4.75, 4.875,
-             5.0, 5.125, 5.25, 5.375, 5.5, 5.625, 5.75, 5.875, 6.0]],
-
-    '4/2': [[0.0, 8.0],
-            [0.0, 4.0, 8.0],
-            [0.0, 2.0, 4.0, 6.0, 8.0],
-            [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
-            [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0, 7.5, 8.0],
-            [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75,
-             3.0, 3.25, 3.5, 3.75, 4.0, 4.25, 4.5, 4.75, 5.0, 5.25, 5.5, 5.75,
-             6.0, 6.25, 6.5, 6.75, 7.0, 7.25, 7.5, 7.75, 8.0],
-            [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-             1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875,
-             2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875,
-             3.0, 3.125, 3.25, 3.375, 3.5, 3.625, 3.75, 3.875,
-             4.0, 4.125, 4.25, 4.375, 4.5, 4.625, 4.75, 4.875,
-             5.0, 5.125, 5.25, 5.375, 5.5, 5.625, 5.75, 5.875,
-             6.0, 6.125, 6.25, 6.375, 6.5, 6.625, 6.75, 6.875,
-             7.0, 7.125, 7.25, 7.375, 7.5, 7.625, 7.75, 7.875, 8.0]],
-
-    '2/4': [[0.0, 2.0],
-            [0.0, 1.0, 2.0],
-            [0.0, 0.5, 1.0, 1.5, 2.0],
-            [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0],
-            [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-             1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875, 2.0]],
-
-    '3/4': [[0.0, 3.0],
-            [0.0, 1.0, 2.0, 3.0],
-            [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0],
-            [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0],
-            [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-             1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875,
-             2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875, 3.0]],
-
-    '4/4': [[0.0, 4.0],
-            [0.0, 2.0, 4.0],
-            [0.0, 1.0, 2.0, 3.0, 4.0],
-            [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0],
-            [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75,
-             2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5, 3.75, 4.0],
-            [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-             1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875,
-             2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875,
-             3.0, 3.125, 3.25, 3.375, 3.5, 3.625, 3.75, 3.875, 4.0]],
-
-    '6/8': [[0.0, 3.0],
-            [0.0, 1.5, 3.0],  # music21 issues with this level
-            [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0],
-            [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0],
-            [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875, 1.0, 1.125, 1.25, 1.375,
-             1.5, 1.625, 1.75, 1.875, 2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875, 3.0]],
-
-    '9/8': [[0.0, 4.5],
-            [0.0, 1.5, 3.0, 4.5],  # music21 issues with this level
-            [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5],
-            [0.0, 0.25, 0.5, 0.75, 1.0, 1.25,
-             1.5, 1.75, 2.0, 2.25, 2.5, 2.75,
-             3.0, 3.25, 3.5, 3.75, 4.0, 4.25, 4.5],
-            [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875, 1.0, 1.125, 1.25, 1.375,
-             1.5, 1.625, 1.75, 1.875, 2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875,
-             3.0, 3.125, 3.25, 3.375, 3.5, 3.625, 3.75, 3.875, 4.0, 4.125, 4.25, 4.375, 4.5]],
-
-    '12/8': [[0.0, 6.0],
-             [0.0, 3.0, 6.0],  # music21 issues with this level
-             [0.0, 1.5, 3.0, 4.5, 6.0],  # music21 issues with this level
-             [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0],
-             [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5,
-              3.75, 4.0, 4.25, 4.5, 4.75, 5.0, 5.25, 5.5, 5.75, 6.0],
-             [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875, 1.0, 1.125, 1.25, 1.375, 1.5, 1.625,
-              1.75, 1.875, 2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875, 3.0, 3.125, 3.25,
-              3.375, 3.5, 3.625, 3.75, 3.875, 4.0, 4.125, 4.25, 4.375, 4.5, 4.625, 4.75, 4.875, 5.0,
-              5.125, 5.25, 5.375, 5.5, 5.625, 5.75, 5.875, 6.0]],
-
-    '2+3/4': [[0.0, 5.0],
-              [0.0, 2.0, 5.0],  # music21 issues with this level
-              [0.0, 1.0, 2.0, 3.0, 4.0, 5.0],
-              [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0],
-              [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75,
-               2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5, 3.75, 4.0, 4.25, 4.5, 4.75, 5.0],
-              [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-               1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875,
-               2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875,
-               3.0, 3.125, 3.25, 3.375, 3.5, 3.625, 3.75, 3.875,
-               4.0, 4.125, 4.25, 4.375, 4.5, 4.625, 4.75, 4.875, 5.0]],
-
-    '3+2/4': [[0.0, 5.0],
-              [0.0, 3.0, 5.0],  # music21 issues with this level
-              [0.0, 1.0, 2.0, 3.0, 4.0, 5.0],
-              [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0],
-              [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75,
-               3.0, 3.25, 3.5, 3.75, 4.0, 4.25, 4.5, 4.75, 5.0],
-              [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-               1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875,
-               2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875,
-               3.0, 3.125, 3.25, 3.375, 3.5, 3.625, 3.75, 3.875,
-               4.0, 4.125, 4.25, 4.375, 4.5, 4.625, 4.75, 4.875, 5.0]],
-
-    '2+2+3/4': [[0.0, 7.0],
-                [0.0, 2.0, 4.0, 7.0],  # music21 issues with this level
-                [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],
-                [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0],
-                [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5,
-                 3.75, 4.0, 4.25, 4.5, 4.75, 5.0, 5.25, 5.5, 5.75, 6.0, 6.25, 6.5, 6.75, 7.0],
-                [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-                 1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875,
-                 2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875,
-                 3.0, 3.125, 3.25, 3.375, 3.5, 3.625, 3.75, 3.875,
-                 4.0, 4.125, 4.25, 4.375, 4.5, 4.625, 4.75, 4.875,
-                 5.0, 5.125, 5.25, 5.375, 5.5, 5.625, 5.75, 5.875,
-                 6.0, 6.125, 6.25, 6.375, 6.5, 6.625, 6.75, 6.875, 7.0]],
-
-    '3+2+2/4': [[0.0, 7.0],
-                [0.0, 3.0, 5.0, 7.0],  # music21 issues with this level
-                [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],
-                [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0],
-                [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5,
-                 3.75, 4.0, 4.25, 4.5, 4.75, 5.0, 5.25, 5.5, 5.75, 6.0, 6.25, 6.5, 6.75, 7.0],
-                [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-                 1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875,
-                 2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875,
-                 3.0, 3.125, 3.25, 3.375, 3.5, 3.625, 3.75, 3.875,
-                 4.0, 4.125, 4.25, 4.375, 4.5, 4.625, 4.75, 4.875,
-                 5.0, 5.125, 5.25, 5.375, 5.5, 5.625, 5.75, 5.875,
-                 6.0, 6.125, 6.25, 6.375, 6.5, 6.625, 6.75, 6.875, 7.0]],
-
-    '2+3+2/4': [[0.0, 7.0],
-                [0.0, 2.0, 5.0, 7.0],  # music21 issues with this level
-                [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],
-                [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0],
-                [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75,
-                 3.0, 3.25, 3.5, 3.75, 4.0, 4.25, 4.5, 4.75, 5.0, 5.25, 5.5, 5.75, 6.0, 6.25, 6.5,
-                 6.75, 7.0],
-                [0.0, 0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875,
-                 1.0, 1.125, 1.25, 1.375, 1.5, 1.625, 1.75, 1.875,
-                 2.0, 2.125, 2.25, 2.375, 2.5, 2.625, 2.75, 2.875,
-                 3.0, 3.125, 3.25, 3.375, 3.5, 3.625, 3.75, 3.875,
-                 4.0, 4.125, 4.25, 4.375, 4.5, 4.625, 4.75, 4.875,
-                 5.0, 5.125, 5.25, 5.375, 5.5, 5.625, 5.75, 5.875,
-                 6.0, 6.125, 6.25, 6.375, 6.5, 6.625, 6.75, 6.875, 7.0]],
+offsetHierarchyExamples = {
+    '2/2': _exampleLevels(4, [4, 2, 1, 0.5, 0.25, 0.125]),
+    '3/2': _exampleLevels(6, [6, 2, 1, 0.5, 0.25, 0.125]),
+    '4/2': _exampleLevels(8, [8, 4, 2, 1, 0.5, 0.25, 0.125]),
+    '2/4': _exampleLevels(2, [2, 1, 0.5, 0.25, 0.125]),
+    '3/4': _exampleLevels(3, [3, 1, 0.5, 0.25, 0.125]),
+    '4/4': _exampleLevels(4, [4, 2, 1, 0.5, 0.25, 0.125]),
+    '6/8': _exampleLevels(3, [3, 1.5, 0.5, 0.25, 0.125]),  # music21 issues with level 1
+    '9/8': _exampleLevels(4.5, [4.5, 1.5, 0.5, 0.25, 0.125]),  # " level 1
+    '12/8': _exampleLevels(6, [6, 3, 1.5, 0.5, 0.25, 0.125]),  # " levels 1 and 2
+    # music21 issues with level 1 of each of the following:
+    '2+3/4': _exampleLevels(5, [5, [0, 2, 5], 1, 0.5, 0.25, 0.125]),
+    '3+2/4': _exampleLevels(5, [5, [0, 3, 5], 1, 0.5, 0.25, 0.125]),
+    '2+2+3/4': _exampleLevels(7, [7, [0, 2, 4, 7], 1, 0.5, 0.25, 0.125]),
+    '3+2+2/4': _exampleLevels(7, [7, [0, 3, 5, 7], 1, 0.5, 0.25, 0.125]),
+    '2+3+2/4': _exampleLevels(7, [7, [0, 2, 5, 7], 1, 0.5, 0.25, 0.125]),
 }
 
 
 # ------------------------------------------------------------------------------
 
-class Test(unittest.TestCase):
+# Shared, read-only test cases: time signature, levels, pulse lengths, and the resulting offsets
+testMetres = (
+    {'ts': '4/4',
+     'levels': (1, 2),
+     'pulses': (4, 2, 1),
+     'offsets': ((0.0, 4.0), (0.0, 2.0, 4.0), (0.0, 1.0, 2.0, 3.0, 4.0))
+     },
+    {'ts': '4/4',
+     'levels': (3,),
+     'pulses': (4, 0.5),
+     'offsets': ((0.0, 4.0), (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0))
+     },
+    {'ts': '6/8',
+     'levels': (1, 2),
+     'pulses': (3, 1.5, 0.5),
+     'offsets': ((0.0, 3.0), (0.0, 1.5, 3.0), (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0))
+     },
+)
+
+# Shared, read-only notes (start offset, length) for the batch tests, in 6/8
+testNotes68 = ((0, 1), (0.25, 2), (0.5, 1), (0.5, 2), (1.75, 0.5), (2.5, 0.5), (2.75, 1))
+
 
-    def setUp(self) -> None:
-
-        self.testMetres = []
-
-        for x in (
-                ('4/4',
-                 [1, 2],
-                 [4, 2, 1],
-                 [[0.0, 4.0], [0.0, 2.0, 4.0], [0.0, 1.0, 2.0, 3.0, 4.0]]
-                 ),
-                ('4/4',
-                 [3],
-                 [4, 0.5],
-                 [[0.0, 4.0], [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0]]
-                 ),
-                ('6/8',
-                 [1, 2],
-                 [3, 1.5, 0.5],
-                 [[0.0, 3.0], [0.0, 1.5, 3.0], [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0]]
-                 ),
-        ):
-            newDict = {'ts': x[0],
-                       'levels': x[1],
-                       'pulses': x[2],
-                       'offsets': x[3]
-                       }
-            self.testMetres.append(newDict)
+class Test(unittest.TestCase):
 
     def testGetOffsetsFromTSAndLevels(self):
-        for tc in self.testMetres:
+        for tc in testMetres:
             t = offsetsFromTSAndLevels(tc['ts'], tc['levels'])
             self.assertEqual(t, tc['offsets'])
 
     def testPulseLengthsToOffsetList(self):
-        for tc in self.testMetres:
+        for tc in testMetres:
             t = offsetListFromPulseLengths(pulseLengths=tc['pulses'],
                                            require2or3betweenLevels=False)
-            self.assertEqual(t, tc['offsets'])
+            self.assertEqual(tuple(tuple(level) for level in t), tc['offsets'])
+            t = offsetListFromPulseLengths(pulseLengths=tc['pulses'], useNumpy=True)
+            self.assertEqual(tuple(tuple(level) for level in t), tc['offsets'])
 
     def testRequire2or3(self):
         """
@@ -789,6 +924,14 @@ class Test(unittest.TestCase):
                           pulseLengths=[4, 1],
                           require2or3betweenLevels=True)
 
+    def testOffsetsFromLengths(self):
+        """
+        Test that the default (plain Python) and NumPy routes agree.
+        """
+        for measureLength, pulseLength in ((4, 1), (4.5, 0.5), (3, 1.5), (5, 2), (1, 0.1)):
+            self.assertEqual(offsetsFromLengths(measureLength, pulseLength),
+                             offsetsFromLengths(measureLength, pulseLength, useNumpy=True))
+
     def testOffsetHierarchyFromTS(self):
         """
         Test offsetHierarchyFromTS by running through all
@@ -796,7 +939,33 @@ class Test(unittest.TestCase):
         """
         for k in offsetHierarchyExamples:
             oh = offsetHierarchyFromTS(k, minimumPulse=32)
-            self.assertEqual(oh, offsetHierarchyExamples[k])
+            self.assertEqual([list(level) for level in oh], offsetHierarchyExamples[k])
+
+    def testHierarchyCache(self):
+        """
+        Test that repeat calls for the same time signature share one cached hierarchy.
+        """
+        self.assertIs(offsetHierarchyFromTS('6/8'), offsetHierarchyFromTS('6/8'))
+        self.assertIs(offsetsFromTSAndLevels('6/8', [1, 2]), offsetsFromTSAndLevels('6/8', (1, 2)))
+        self.assertIs(ReGrouper(0, 1, pulseLengths=[4, 2, 1]).offsetHierarchy,
+                      ReGrouper(2, 1, pulseLengths=(4, 2, 1)).offsetHierarchy)
+
+    def testUserHierarchyCache(self):
+        """
+        Test that equal user-defined hierarchies (e.g. lists) share one interned hierarchy
+        and one set of lookup tables, rather than rebuilding them for every note,
+        and that a changed hierarchy is not mistaken for the old one.
+        """
+        levels = [[0.0, 3.0], [0.0, 1.5, 3.0], [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0]]
+        first = ReGrouper(0.5, 2, offsetHierarchy=levels).offsetHierarchy
+        numCached = len(_lookupTablesCache)
+        second = ReGrouper(1, 1, offsetHierarchy=[list(level) for level in levels]).offsetHierarchy
+        self.assertIs(first, second)
+        self.assertIs(_lookupTables(levels), _lookupTables(first))
+        self.assertEqual(len(_lookupTablesCache), numCached)
+
+        levels[1].remove(1.5)
+        self.assertEqual(splitNote(0.5, 2, levels), [(0.5, 2)])
 
     def testFromPulseLength(self):
         """
@@ -880,6 +1049,69 @@ class Test(unittest.TestCase):
         testCase2 = ReGrouper(0.5, 2, timeSignature='6/8', splitSameLevel=True)
         self.assertEqual(testCase2.offsetDurationPairs, [(0.5, 0.5), (1, 0.5), (1.5, 1)])
 
+    def testSplitMany(self):
+        """
+        Tests that the batch splitMany matches ReGrouper note by note.
+        """
+        for splitSameLevel in (False, True):
+            noteIndices, offsets, durations = splitMany([x[0] for x in testNotes68],
+                                                        [x[1] for x in testNotes68],
+                                                        timeSignature='6/8',
+                                                        splitSameLevel=splitSameLevel)
+            expected = []
+            for i, (start, length) in enumerate(testNotes68):
+                testCase = ReGrouper(start, length, timeSignature='6/8',
+                                     splitSameLevel=splitSameLevel)
+                expected += [(i, o, d) for o, d in testCase.offsetDurationPairs]
+            self.assertEqual(list(zip(noteIndices, offsets, durations)), expected)
+
+    def testBatch(self):
+        """
+        Tests that ReGrouper.batch matches ReGrouper note by note.
+        """
+        offsetHierarchy = [[0.0, 3.0], [0.0, 1.5, 3.0], [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0]]
+        for splitSameLevel in (False, True):
+            self.assertEqual(ReGrouper.batch(testNotes68, offsetHierarchy=offsetHierarchy,
+                                             splitSameLevel=splitSameLevel),
+                             [ReGrouper(start, length, offsetHierarchy=offsetHierarchy,
+                                        splitSameLevel=splitSameLevel).offsetDurationPairs
+                              for start, length in testNotes68])
+
+    def testBatchCache(self):
+        """
+        Tests that repeated batch calls (e.g. measure by measure) in one time signature
+        share one set of cached lookup tables.
+        """
+        ReGrouper.batch(testNotes68[:2], timeSignature='6/8')
+        numCached = len(_lookupTablesCache)
+        ReGrouper.batch(testNotes68[2:], timeSignature='6/8')
+        self.assertEqual(len(_lookupTablesCache), numCached)
+        self.assertIn(id(offsetsFromTSAndLevels('6/8')), _lookupTablesCache)
+
+    def testFractionInput(self):
+        """
+        Tests a note given in Fractions (as for music21 offsets).
+        """
+        testCase = ReGrouper(Fraction(1, 2), Fraction(2), timeSignature='6/8')
+        self.assertEqual(testCase.offsetDurationPairs, [(0.5, 1), (1.5, 1)])
+
+    def testAcrossBarline(self):
+        """
+        Tests that a note running past the end of the measure
+        is split once at the barline.
+        """
+        testCase = ReGrouper(3, 2, timeSignature='4/4')
+        self.assertEqual(testCase.offsetDurationPairs, [(3, 1.0), (4.0, 1.0)])
+
+    def testNumpyOffsetHierarchy(self):
+        """
+        Tests a user-defined offsetHierarchy given as NumPy arrays.
+        """
+        import numpy as np
+        oh = [np.array([0.0, 4.0]), np.arange(0, 4.5, 1.0), np.arange(0, 4.25, 0.5)]
+        testCase = ReGrouper(0.5, 2, offsetHierarchy=oh)
+        self.assertEqual(testCase.offsetDurationPairs, [(0.5, 0.5), (1.0, 1.5)])
+
 
 # -----------------------------------------------------------------------------
 